@@ -0,0 +1,235 @@
+"""
+Shoebox room acoustics (lightweight analytics, no audio): volume/surface,
+band RT60 tilt, axial/tangential/oblique room modes and early reflections.
+Pure functions of a few scalars; app.py wires them to the site catalog.
+"""
+import functools
+import math
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; fall back to the NumPy path
+    njit = None
+
+C_SOUND = 343.0
+C_HALF = C_SOUND / 2.0
+STD_BANDS = [125, 250, 500, 1000, 2000, 4000]
+
+def room_volume(dims):
+    L, W, H = dims
+    return float(L * W * H)
+
+def room_surface(dims):
+    L, W, H = dims
+    return float(2.0 * (L * W + L * H + W * H))
+
+def avg_absorption_from_rt60(rt60, V, S):
+    if rt60 <= 0 or S <= 0:
+        return 0.2
+    a = 0.161 * V / (rt60 * S)
+    return float(min(max(a, 0.02), 0.9))
+
+def _band_log_ratio(bands):
+    return np.log10(np.maximum(np.asarray(bands, dtype=np.float64), 125) / 500.0)
+
+_STD_BAND_LOG = _band_log_ratio(STD_BANDS)
+
+# The acoustic helpers below are pure functions of a handful of scalars, and
+# requests repeat the same site/parameter combinations, so each keeps an LRU of
+# immutable results and hands callers a fresh mutable copy.
+
+@functools.lru_cache(maxsize=512)
+def _rt60_tilt_cached(base_rt, bands):
+    log_ratio = _STD_BAND_LOG if list(bands) == STD_BANDS else _band_log_ratio(bands)
+    vals = np.maximum(0.2, base_rt - 0.18 * log_ratio)
+    return tuple(zip((str(int(f)) for f in bands), vals.tolist()))
+
+def rt60_tilt_by_band(base_rt, bands):
+    return dict(_rt60_tilt_cached(float(base_rt), tuple(bands)))
+
+def band_arrays(rt60_by_band):
+    """Split an rt60_by_band dict into (band_freqs, band_rt) arrays sorted by frequency."""
+    pairs = sorted((int(b), float(v)) for b, v in rt60_by_band.items())
+    band_freqs = np.array([b for b, _ in pairs], dtype=np.float64)
+    band_rt = np.array([v for _, v in pairs], dtype=np.float64)
+    return band_freqs, band_rt
+
+def nearest_band_index(band_freqs, f_hz):
+    # band_freqs must be sorted; ties go to the lower band
+    f_hz = np.asarray(f_hz, dtype=np.float64)
+    if band_freqs.size < 2:
+        return np.zeros(f_hz.shape, dtype=np.intp)
+    idx = np.clip(np.searchsorted(band_freqs, f_hz), 1, band_freqs.size - 1)
+    pick_left = (f_hz - band_freqs[idx - 1]) <= (band_freqs[idx] - f_hz)
+    return np.where(pick_left, idx - 1, idx)
+
+def nearest_band_rt60(rt60_by_band, f_hz):
+    band_freqs, band_rt = band_arrays(rt60_by_band)
+    return float(band_rt[nearest_band_index(band_freqs, f_hz)])
+
+def schroeder_frequency(rt60, V):
+    if V <= 0 or rt60 <= 0:
+        return None
+    return 2000.0 * math.sqrt(rt60 / V)
+
+def modal_type(nx, ny, nz):
+    npos = int(nx > 0) + int(ny > 0) + int(nz > 0)
+    return "axial" if npos == 1 else ("tangential" if npos == 2 else "oblique")
+
+MODE_ORDER_MAX = 12
+
+def mode_order_limit(L, fmax):
+    # the axial mode n*c/(2L) is the lowest with index n, so n > 2*fmax*L/c never
+    # passes the fmax mask; +2 keeps the boundary mode despite rounding
+    return int(min(MODE_ORDER_MAX, max(0.0, 2.0 * fmax * max(L, 1e-6) / C_SOUND) + 2))
+
+# every (nx, ny, nz) index triple below MODE_ORDER_MAX except (0,0,0), nx-major
+_MODE_INDEX = np.stack(
+    np.meshgrid(*(np.arange(MODE_ORDER_MAX),) * 3, indexing="ij"), axis=-1
+).reshape(-1, 3)[1:]
+_MODE_INDEX.flags.writeable = False
+
+def _modes_numpy(Lx, Ly, Lz, Nx, Ny, Nz, fmax, top_n, band_freqs, band_rt):
+    # band_freqs/band_rt come from band_arrays() (sorted); empty means a flat 3.0 s
+    idx = _MODE_INDEX[(_MODE_INDEX < (Nx, Ny, Nz)).all(axis=1)]
+    q = idx / np.maximum((Lx, Ly, Lz), 1e-6)
+    q *= q
+    f = C_HALF * np.sqrt(q[:, 0] + q[:, 1] + q[:, 2])
+    nx, ny, nz = idx[:, 0], idx[:, 1], idx[:, 2]
+    keep = f <= fmax
+    f, nx, ny, nz = f[keep], nx[keep], ny[keep], nz[keep]
+
+    # top_n lowest modes; energy is a function of f alone, so a stable sort on f
+    # matches the (freq, -rel_energy) ordering
+    if 0 < top_n < f.size:
+        kth = np.partition(f, top_n - 1)[top_n - 1]
+        cand = np.flatnonzero(f <= kth)
+    else:
+        cand = np.arange(f.size)
+    sel = cand[np.argsort(f[cand], kind="stable")][:top_n]
+    f, nx, ny, nz = f[sel], nx[sel], ny[sel], nz[sel]
+
+    if band_freqs.size:
+        T_here = band_rt[nearest_band_index(band_freqs, f)]
+    else:
+        T_here = np.full(f.shape, 3.0)
+    B = 13.815510558 / (math.pi * np.maximum(T_here, 1e-6))  # Hz
+    peak_e = (1.0 / np.maximum(B, 1e-6)) * (1.0 / np.maximum(f, 50.0))
+    return f, nx, ny, nz, B, peak_e
+
+def _modes_loop(Lx, Ly, Lz, Nx, Ny, Nz, fmax, top_n, band_freqs, band_rt):
+    # same contract as _modes_numpy, written as plain loops for numba
+    Lx, Ly, Lz = max(Lx, 1e-6), max(Ly, 1e-6), max(Lz, 1e-6)
+    cap = max(Nx * Ny * Nz - 1, 0)
+    f_all = np.empty(cap)
+    n_all = np.empty((cap, 3), dtype=np.int64)
+    m = 0
+    # per-axis terms hoisted to their own loop level; the sum keeps the
+    # ((x + y) + z) order so frequencies match _modes_numpy bit for bit
+    for a in range(Nx):
+        qx = (a / Lx) ** 2
+        for b in range(Ny):
+            qxy = qx + (b / Ly) ** 2
+            for c in range(Nz):
+                if a == 0 and b == 0 and c == 0:
+                    continue
+                fi = C_HALF * math.sqrt(qxy + (c / Lz) ** 2)
+                if fi <= fmax:
+                    f_all[m] = fi
+                    n_all[m, 0] = a
+                    n_all[m, 1] = b
+                    n_all[m, 2] = c
+                    m += 1
+
+    k = top_n if top_n >= 0 else max(m + top_n, 0)
+    k = min(k, m)
+    order = np.argsort(f_all[:m], kind="mergesort")[:k]
+
+    f = np.empty(k)
+    nx = np.empty(k, dtype=np.int64)
+    ny = np.empty(k, dtype=np.int64)
+    nz = np.empty(k, dtype=np.int64)
+    B = np.empty(k)
+    peak_e = np.empty(k)
+    for i in range(k):
+        j = order[i]
+        fi = f_all[j]
+        T_here = 3.0
+        best = np.inf
+        for bi in range(band_freqs.size):
+            d = abs(band_freqs[bi] - fi)
+            if d < best:
+                best = d
+                T_here = band_rt[bi]
+        Bi = 13.815510558 / (math.pi * max(T_here, 1e-6))
+        f[i] = fi
+        nx[i] = n_all[j, 0]
+        ny[i] = n_all[j, 1]
+        nz[i] = n_all[j, 2]
+        B[i] = Bi
+        peak_e[i] = (1.0 / max(Bi, 1e-6)) * (1.0 / max(fi, 50.0))
+    return f, nx, ny, nz, B, peak_e
+
+if njit is not None:
+    _mode_kernel = njit(cache=True)(_modes_loop)
+    # compile (or load from cache) at import so the first request and every
+    # forked gunicorn worker start with a ready kernel
+    _mode_kernel(10.0, 8.0, 4.0, 3, 3, 3, 100.0, 4,
+                 np.array(STD_BANDS, dtype=np.float64), np.ones(len(STD_BANDS)))
+else:
+    _mode_kernel = _modes_numpy
+
+# modal_type() indexed by the number of non-zero mode indices
+_MODE_TYPE_BY_NPOS = ("oblique", "axial", "tangential", "oblique")
+
+@functools.lru_cache(maxsize=512)
+def _modal_list_cached(dims, fmax, top_n, rt60_items):
+    Lx, Ly, Lz = dims
+    if rt60_items:
+        band_freqs, band_rt = band_arrays(dict(rt60_items))
+    else:
+        band_freqs = band_rt = np.empty(0)
+    f, nx, ny, nz, B, peak_e = _mode_kernel(
+        Lx, Ly, Lz,
+        mode_order_limit(Lx, fmax), mode_order_limit(Ly, fmax), mode_order_limit(Lz, fmax),
+        fmax, top_n, band_freqs, band_rt
+    )
+    esum = float(peak_e.sum()) or 1.0
+
+    return tuple(
+        {
+            "freq_hz": fi,
+            "nx": a, "ny": b, "nz": c,
+            "type": _MODE_TYPE_BY_NPOS[(a > 0) + (b > 0) + (c > 0)],
+            "bandwidth_hz": Bi,
+            "gauss_sigma_hz": Bi / 2.355,
+            "rel_energy": ei / esum
+        }
+        for fi, a, b, c, Bi, ei in zip(
+            f.tolist(), nx.tolist(), ny.tolist(), nz.tolist(), B.tolist(), peak_e.tolist()
+        )
+    )
+
+def modal_list(dims, fmax=2000.0, top_n=24, rt60_by_band=None):
+    rt60_items = tuple(sorted(rt60_by_band.items())) if rt60_by_band else ()
+    modes = _modal_list_cached(tuple(float(d) for d in dims), float(fmax), int(top_n), rt60_items)
+    return [dict(m) for m in modes]
+
+_ER_BOUNCES = np.array([0, 1, 1, 1, 2, 2])
+
+@functools.lru_cache(maxsize=512)
+def _early_reflections_cached(dims, alpha_avg, n):
+    L, W, H = dims
+    n = max(1, n)
+    d = np.array([0.0, 2 * L, 2 * W, 2 * H, 2 * math.hypot(L, W), 2 * math.hypot(L, H)])[:n]
+    reflectance = (1.0 - alpha_avg) ** _ER_BOUNCES[:n]
+    e = np.where(d == 0.0, 1.0, reflectance / np.maximum(d * d, 1e-6))
+    e /= float(e.sum()) or 1.0
+    t_ms = (d / C_SOUND) * 1000.0
+    return tuple(zip(t_ms.tolist(), e.tolist()))
+
+def early_reflections(dims, alpha_avg, n=6):
+    taps = _early_reflections_cached(tuple(float(d) for d in dims), float(alpha_avg), int(n))
+    return [list(tap) for tap in taps]
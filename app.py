@@ -1,14 +1,47 @@
-from flask import Flask, jsonify, request, url_for
+from flask import Flask, request, url_for
 from flask_cors import CORS
+from flask_compress import Compress
 import unicodedata
+import hashlib
+import gzip
+import functools
+from collections import namedtuple
 import os
+import sys
 import json
-import math
+
+import numpy as np
+import orjson
+
+from acoustics import (
+    STD_BANDS,
+    avg_absorption_from_rt60,
+    early_reflections,
+    modal_list,
+    room_surface,
+    room_volume,
+    rt60_tilt_by_band,
+    schroeder_frequency,
+)
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip is always available
+    brotli = None
 
 app = Flask(__name__)
 
 CORS(app, resources={r"/*": {"origins": "*"}})
 
+# Compress only encodes the live /generate-ir bodies (_compressed_json_response).
+# It is not registered as an after_request hook: its Accept-Encoding parsing
+# ignores q=0, and it would re-encode the identity variant of the precomputed
+# bodies. Both paths negotiate the coding with Werkzeug instead.
+app.config["COMPRESS_ALGORITHM"] = ["br", "gzip"]
+app.config["COMPRESS_MIN_SIZE"] = 512
+app.config["COMPRESS_REGISTER"] = False
+_compress = Compress(app)
+
 
 
 
@@ -29,44 +62,139 @@ def load_image_manifest():
     except Exception:
         return {}
 
-IMAGE_MANIFEST = load_image_manifest()
-
 # -----------------------------
 # Text normalization
 # -----------------------------
 
+_QUOTES_TBL = str.maketrans({"’": "'", "‘": "'"})
+_QUOTES_DASHES_TBL = str.maketrans({"’": "'", "‘": "'", "–": "-", "—": "-"})
+
 def norm_text(s: str) -> str:
     if not isinstance(s, str):
         return s
     # unify quotes and dashes, squeeze spaces, lowercase
-    s = (
-        s.replace("’", "'")
-         .replace("‘", "'")
-         .replace("–", "-")
-         .replace("—", "-")
-         .strip()
-         .lower()
-    )
+    s = s.translate(_QUOTES_DASHES_TBL).strip().lower()
     return " ".join(s.split())
 
 # also used for manifest lookups (case/quote-insensitive)
 
 def _norm_key(s: str) -> str:
     # normalize unicode and unify quotes/spaces
-    return unicodedata.normalize("NFKC", (s or "").replace("’", "'").replace("‘", "'").strip()).lower()
+    return unicodedata.normalize("NFKC", (s or "").translate(_QUOTES_TBL).strip()).lower()
+
+def build_manifest_index(manifest):
+    """Map normalized manifest titles to image files (first title wins)."""
+    index = {}
+    for title, meta in manifest.items():
+        if isinstance(meta, dict) and meta.get("file"):
+            index.setdefault(_norm_key(title), meta["file"])
+    return index
 
 # -----------------------------
-# Numpy-safe JSON conversion
+# JSON responses (orjson; numpy arrays/scalars serialize natively)
 # -----------------------------
 
-def np_to_native(x):
-    if isinstance(x, (list, tuple)):
-        return [np_to_native(i) for i in x]
-    if isinstance(x, dict):
-        return {k: np_to_native(v) for k, v in x.items()}
-    if isinstance(x, (float, int)):
-        return float(x)
-    return x
+def _dumps(obj) -> bytes:
+    return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+
+def _json_response_raw(body, status=200):
+    return app.response_class(body, status=status, mimetype="application/json")
+
+def _json_response(obj, status=200):
+    return _json_response_raw(_dumps(obj), status)
+
+# Catalog-derived responses change on /reload, so caches must revalidate with
+# the ETag every time instead of holding a copy for a fixed max-age.
+CACHE_CONTROL = "no-cache"
+
+def _etag(body: bytes) -> str:
+    return hashlib.blake2b(body, digest_size=8).hexdigest()
+
+def _coding_etag(etag, coding):
+    """ETag of one content-coding of a body: "<etag>:<coding>"; identity keeps the body ETag."""
+    return etag if coding == "identity" else f"{etag}:{coding}"
+
+def _match_etag(*tags):
+    """
+    First of tags that If-None-Match contains, or None. If-None-Match uses the
+    weak comparison, so W/"<tag>" matches too. Only GET/HEAD are conditional:
+    anything else just carries the ETag (a matching If-None-Match there would
+    call for 412, not 304).
+    """
+    if request.method not in ("GET", "HEAD"):
+        return None
+    inm = request.if_none_match
+    for tag in tags:
+        if inm.contains_weak(tag):
+            return tag
+    return None
+
+def _cached(resp_or_none, etag):
+    """Attach ETag/Cache-Control; None means If-None-Match matched and becomes an empty 304."""
+    resp = resp_or_none if resp_or_none is not None else app.response_class(status=304)
+    resp.set_etag(etag)
+    resp.headers["Cache-Control"] = CACHE_CONTROL
+    return resp
+
+def _cached_json_response(body, etag=None):
+    """200 with ETag/Cache-Control, or an empty 304 when a GET's If-None-Match matches."""
+    etag = etag or _etag(body)
+    if _match_etag(etag):
+        return _cached(None, etag)
+    return _cached(_json_response_raw(body), etag)
+
+def precompress(body: bytes) -> dict:
+    """
+    Content-coding -> bytes for a static body, compressed once (gzip 9, br 10:
+    within 1% of br 11 on these payloads at a third of the time).
+    Codings that do not make the body smaller are skipped.
+    """
+    out = {"identity": body}
+    encoded = {"gzip": gzip.compress(body, compresslevel=9)}
+    if brotli is not None:
+        encoded["br"] = brotli.compress(body, quality=10)
+    for coding, data in encoded.items():
+        if len(data) < len(body):
+            out[coding] = data
+    return out
+
+def _precompressed_response(variants, etag):
+    """
+    Serve a precompress() dict. Each coding is its own representation, so it
+    gets its own ETag (see _coding_etag).
+    """
+    offered = [c for c in ("br", "gzip") if c in variants]
+    coding = request.accept_encodings.best_match(offered, default="identity")
+    etag = _coding_etag(etag, coding)
+    if _match_etag(etag):
+        resp = None
+    else:
+        resp = _json_response_raw(variants[coding])
+        if coding != "identity":
+            resp.headers["Content-Encoding"] = coding
+    resp = _cached(resp, etag)
+    resp.vary.add("Accept-Encoding")
+    return resp
+
+def _compressed_json_response(body):
+    """
+    Per-request body (live /generate-ir), encoded with Compress's levels when
+    it is large enough and the client accepts br or gzip.
+    """
+    coding = "identity"
+    if len(body) >= app.config["COMPRESS_MIN_SIZE"]:
+        coding = request.accept_encodings.best_match(app.config["COMPRESS_ALGORITHM"], default="identity")
+    etag = _coding_etag(_etag(body), coding)
+    if _match_etag(etag):
+        resp = None
+    else:
+        resp = _json_response_raw(body)
+        if coding != "identity":
+            resp.set_data(_compress.compress(app, resp, coding))
+            resp.headers["Content-Encoding"] = coding
+    resp = _cached(resp, etag)
+    resp.vary.add("Accept-Encoding")
+    return resp
 
 # -----------------------------
 # JSON parsing helpers
@@ -109,6 +237,8 @@ def _build_maps(sites_list):
         sacred_sites[key] = site
         region_map.setdefault(region_or_country, []).append(site_name)
 
+    # regions and their site lists only change on reload: sort them once here
+    region_map = {r: sorted(names) for r, names in sorted(region_map.items())}
     return sacred_sites, region_map
 
 
@@ -126,132 +256,221 @@ def load_sacred_sites():
     # last-resort empty structures
     return {}, {}, DEFAULT_DISCLAIMER
 
-# -----------------------------
-# Load once on startup
-# -----------------------------
-SACRED_SITES, REGION_MAP, DISCLAIMER = load_sacred_sites()
+def build_listing_json(sacred_sites, region_map):
+    """
+    (precompress() variants, etag) for the /sites, /sites-by-country and
+    /countries bodies; all only change on /reload.
+    """
+    names = [info.get("site", k) for k, info in sacred_sites.items()]
+    bodies = (
+        _dumps({"sites": sorted(names)}),
+        _dumps(region_map),
+        _dumps({"countries": list(region_map)}),
+    )
+    return tuple((precompress(body), _etag(body)) for body in bodies)
+
+def build_country_lookup(region_map):
+    """Normalized country name -> region_map key, for /sites-for-country."""
+    return {norm_text(r): r for r in region_map}
+
+def build_country_json(region_map):
+    """region_map key -> (body, etag) of its /sites-for-country response."""
+    out = {}
+    for region, names in region_map.items():
+        body = _dumps({"country": region, "sites": names})
+        out[region] = (body, _etag(body))
+    return out
+
+def build_site_arrays(sacred_sites):
+    """
+    Structure-of-arrays copy of the numeric site fields: site_index maps a
+    normalized site key to its row in site_rt60 (N,) and site_dims (N, 3).
+    Sites without a numeric rt60 and 3-element dims are left out.
+    """
+    index, rt60, dims = {}, [], []
+    for key, info in sacred_sites.items():
+        try:
+            row_dims = [float(x) for x in info["dims"]]
+            row_rt = float(info["rt60"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if len(row_dims) != 3:
+            continue
+        index[key] = len(rt60)
+        rt60.append(row_rt)
+        dims.append(row_dims)
+    rt60_arr = np.array(rt60, dtype=np.float64)
+    dims_arr = np.array(dims, dtype=np.float64).reshape(-1, 3)
+    rt60_arr.flags.writeable = False
+    dims_arr.flags.writeable = False
+    return index, rt60_arr, dims_arr
 
 # -----------------------------
-# Acoustic analytics (lightweight, no audio)
+# /generate-ir payload
 # -----------------------------
-C_SOUND = 343.0
-STD_BANDS = [125, 250, 500, 1000, 2000, 4000]
 
-def room_volume(dims):
-    L, W, H = dims
-    return float(L * W * H)
+def build_ir_payload(caches, site_k, info, bands, fmax, top_n):
+    i = caches.site_index.get(site_k)
+    if i is None:
+        raise KeyError(f"no usable rt60/dims for '{site_k}'")
+    dims = caches.site_dims[i]
+    base_rt = float(caches.site_rt60[i])
 
-def room_surface(dims):
-    L, W, H = dims
-    return float(2.0 * (L * W + L * H + W * H))
+    V = room_volume(dims)
+    S = room_surface(dims)
+    rt60_by_band = rt60_tilt_by_band(base_rt, bands)
+    alpha_avg = avg_absorption_from_rt60(base_rt, V, S)
+    fs = schroeder_frequency(base_rt, V)
+    tail_ref = float(min(3.0, max(1.0, base_rt)))
 
-def avg_absorption_from_rt60(rt60, V, S):
-    if rt60 <= 0 or S <= 0:
-        return 0.2
-    a = 0.161 * V / (rt60 * S)
-    return float(min(max(a, 0.02), 0.9))
+    geometry_notes = info.get("geometry", info.get("sacred_geometry_notes", ""))
+    sim_method = info.get("sim_method", info.get("simulation_method", ""))
+
+    return {
+        "site": info.get("site", ""),
+        "region": info.get("region", info.get("country", "")),
+        "status": info.get("status", ""),
+        "dims_m": dims.tolist(),
+        "volume_m3": V,
+        "surface_area_m2": S,
+        "absorption_avg": alpha_avg,
+        "rt60_s_by_band": rt60_by_band,
+        "schroeder_freq_hz": fs,
+        "modal_summary": modal_list(dims, fmax=fmax, top_n=top_n, rt60_by_band=rt60_by_band),
+        "early_reflection_taps": early_reflections(dims, alpha_avg, n=6),
+        "ir_tail_sec_reference": tail_ref,
+        "method": "simulation_only_shoebox_analytics",
+        "notes": geometry_notes,
+        "description": info.get("description", ""),
+        "why_sacred": info.get("why_sacred", ""),
+        "who_for": info.get("who_for", ""),
+        "health_benefits": info.get("health_benefits", ""),
+        "sim_method": sim_method,
+        "sources": info.get("sources", ""),
+        "disclaimer": caches.disclaimer
+    }
 
-def rt60_tilt_by_band(base_rt, bands):
+def build_default_payloads(caches):
+    """
+    Serialize the /generate-ir response for every site at default parameters
+    (STD_BANDS, fmax 2000 Hz, top 24 modes) as (precompress() variants, etag).
+    Sites that fail are left out and fall back to the live path.
+    """
     out = {}
-    for f in bands:
-        tilt = -0.18 * math.log10(max(f, 125) / 500.0)
-        out[str(int(f))] = float(max(0.2, base_rt + tilt))
+    for key, info in caches.sacred_sites.items():
+        try:
+            payload = build_ir_payload(caches, key, info, STD_BANDS, 2000.0, 24)
+            body = _dumps(payload)
+            out[key] = (precompress(body), _etag(body))
+        except Exception as e:
+            print(f"Failed to precompute IR payload for '{key}':", e)
     return out
 
-def nearest_band_rt60(rt60_by_band, f_hz):
-    bands = [int(b) for b in rt60_by_band.keys()]
-    b = min(bands, key=lambda x: abs(x - f_hz))
-    return float(rt60_by_band[str(b)])
-
-def schroeder_frequency(rt60, V):
-    if V <= 0 or rt60 <= 0:
-        return None
-    return 2000.0 * math.sqrt(rt60 / V)
-
-def modal_type(nx, ny, nz):
-    npos = int(nx > 0) + int(ny > 0) + int(nz > 0)
-    return "axial" if npos == 1 else ("tangential" if npos == 2 else "oblique")
-
-def modal_list(dims, fmax=2000.0, top_n=24, rt60_by_band=None):
-    Lx, Ly, Lz = dims
-    modes = []
-    for nx in range(0, 12):
-        for ny in range(0, 12):
-            for nz in range(0, 12):
-                if nx == ny == nz == 0:
-                    continue
-                f = (C_SOUND / 2.0) * math.sqrt(
-                    (nx / max(Lx, 1e-6)) ** 2 + (ny / max(Ly, 1e-6)) ** 2 + (nz / max(Lz, 1e-6)) ** 2
-                )
-                if f <= fmax:
-                    T_here = nearest_band_rt60(rt60_by_band, f) if rt60_by_band else 3.0
-                    B = 13.815510558 / (math.pi * max(T_here, 1e-6))  # Hz
-                    peak_e = (1.0 / max(B, 1e-6)) * (1.0 / max(f, 50.0))
-                    modes.append({
-                        "freq_hz": float(f),
-                        "nx": nx, "ny": ny, "nz": nz,
-                        "type": modal_type(nx, ny, nz),
-                        "bandwidth_hz": float(B),
-                        "gauss_sigma_hz": float(B / 2.355),
-                        "rel_energy": float(peak_e)
-                    })
-    modes.sort(key=lambda m: (m["freq_hz"], -m["rel_energy"]))
-    sel = modes[:int(top_n)]
-    esum = sum(m["rel_energy"] for m in sel) or 1.0
-    for m in sel:
-        m["rel_energy"] = float(m["rel_energy"] / esum)
-    return sel
-
-def early_reflections(dims, alpha_avg, n=6):
-    L, W, H = dims
-    paths = [
-        0.0,
-        2 * L, 2 * W, 2 * H,
-        2 * math.sqrt(L * L + W * W),
-        2 * math.sqrt(L * L + H * H),
-    ][:max(1, n)]
-    taps = []
-    for d in paths:
-        t_ms = (d / C_SOUND) * 1000.0
-        if d == 0.0:
-            e = 1.0
-        else:
-            bounces = 1 if d in (2 * L, 2 * W, 2 * H) else 2
-            reflectance = (1.0 - alpha_avg) ** bounces
-            e = reflectance / max(d * d, 1e-6)
-        taps.append([float(t_ms), float(e)])
-    total = sum(e for _, e in taps) or 1.0
-    return [[t, e / total] for t, e in taps]
-
 # -----------------------------
 # Image helpers
 # -----------------------------
 
-def image_filename_for_site(site_name: str) -> str | None:
+def image_filename_for_site(site_name: str, manifest, manifest_norm) -> str | None:
     """
     Look up an image filename for a site:
-    1) exact key match in IMAGE_MANIFEST
-    2) normalized-title match against IMAGE_MANIFEST keys
+    1) exact key match in the manifest
+    2) normalized-title match via manifest_norm (build_manifest_index)
     """
     if not site_name:
         return None
     # exact title match
-    entry = IMAGE_MANIFEST.get(site_name)
+    entry = manifest.get(site_name)
     if isinstance(entry, dict) and entry.get("file"):
         return entry["file"]
     # normalized title match
-    nk = _norm_key(site_name)
-    for title, meta in IMAGE_MANIFEST.items():
-        if isinstance(meta, dict) and meta.get("file") and _norm_key(title) == nk:
-            return meta["file"]
-    return None
+    return manifest_norm.get(_norm_key(site_name))
+
+def build_site_info_parts(sacred_sites, disclaimer, manifest, manifest_norm):
+    """
+    Pre-serialized /site-info bodies as (head, img_file, tail). image_url needs
+    the request host, so each response is head + image_url + tail, with head
+    holding every field before it (no closing brace) and tail the disclaimer.
+    """
+    tail = b',"disclaimer":' + _dumps(disclaimer) + b"}"
+    out = {}
+    for key, info in sacred_sites.items():
+        display_name = info.get("site", key)
+        head = _dumps({
+            "site": display_name,
+            "region": info.get("region", info.get("country", "")),
+            "status": info.get("status", ""),
+            "rt60": info.get("rt60"),
+            "dims": info.get("dims"),
+            # allow alternate keys if present
+            "geometry": info.get("geometry", info.get("sacred_geometry_notes", "")),
+            "description": info.get("description", ""),
+            "why_sacred": info.get("why_sacred", ""),
+            "who_for": info.get("who_for", ""),
+            "health_benefits": info.get("health_benefits", ""),
+            "sim_method": info.get("sim_method", info.get("simulation_method", "")),
+            "sources": info.get("sources", ""),
+        })[:-1]
+        out[key] = (head, image_filename_for_site(display_name, manifest, manifest_norm), tail)
+    return out
+
+@functools.lru_cache(maxsize=1024)
+def _site_info_variants(head, image_url, tail):
+    # image_url only varies with the request host, so in practice this holds
+    # one entry per site; parts from before a /reload simply age out
+    body = head + b',"image_url":' + _dumps(image_url) + tail
+    return precompress(body), _etag(body)
+
+# -----------------------------
+# Catalog caches
+# -----------------------------
+# Everything derived from the catalog and the image manifest lives in one
+# _Caches tuple that /reload replaces with a single assignment, so a request
+# running alongside a reload sees either the old set or the new one, never a
+# mix. Handlers read _CACHES once and use that snapshot throughout.
+_Caches = namedtuple("_Caches", [
+    "sacred_sites", "region_map", "disclaimer",
+    "image_manifest", "manifest_norm",
+    "site_index", "site_rt60", "site_dims",
+    "default_payloads",
+    "sites_json", "sites_by_country_json", "countries_json",
+    "lc_country_map", "country_json",
+    "site_info_parts",
+])
+
+def _build_caches(sacred_sites, region_map, disclaimer, manifest):
+    manifest_norm = build_manifest_index(manifest)
+    site_index, site_rt60, site_dims = build_site_arrays(sacred_sites)
+    sites_json, sites_by_country_json, countries_json = build_listing_json(sacred_sites, region_map)
+    caches = _Caches(
+        sacred_sites=sacred_sites,
+        region_map=region_map,
+        disclaimer=disclaimer,
+        image_manifest=manifest,
+        manifest_norm=manifest_norm,
+        site_index=site_index,
+        site_rt60=site_rt60,
+        site_dims=site_dims,
+        default_payloads={},
+        sites_json=sites_json,
+        sites_by_country_json=sites_by_country_json,
+        countries_json=countries_json,
+        lc_country_map=build_country_lookup(region_map),
+        country_json=build_country_json(region_map),
+        site_info_parts=build_site_info_parts(sacred_sites, disclaimer, manifest, manifest_norm),
+    )
+    # the default payloads run the full /generate-ir path over the other caches
+    return caches._replace(default_payloads=build_default_payloads(caches))
+
+# Load once on startup
+_CACHES = _build_caches(*load_sacred_sites(), load_image_manifest())
 
 # -----------------------------
 # Routes
 # -----------------------------
 @app.route("/")
 def home():
-    return jsonify({
+    c = _CACHES
+    return _json_response({
         "message": "Welcome to Sanctra API (lightweight simulation only)",
         "endpoints": [
             "/health",
@@ -266,113 +485,101 @@ def home():
         ],
         "note": "POST /generate-ir returns compact JSON acoustic analytics.",
         "cache_sizes": {
-            "sites": len(SACRED_SITES),
-            "countries": len(REGION_MAP)
+            "sites": len(c.sacred_sites),
+            "countries": len(c.region_map)
         },
-        "disclaimer": DISCLAIMER
+        "disclaimer": c.disclaimer
     })
 
 @app.route("/health", methods=["GET"])
 def health():
-    ok = bool(SACRED_SITES)
-    return jsonify({"status": "ok" if ok else "degraded", "sites_cached": len(SACRED_SITES)}), 200
+    sacred_sites = _CACHES.sacred_sites
+    ok = bool(sacred_sites)
+    return _json_response({"status": "ok" if ok else "degraded", "sites_cached": len(sacred_sites)}, 200)
 
 @app.route("/reload", methods=["POST"])
 def reload_cache():
-    global SACRED_SITES, REGION_MAP, DISCLAIMER
-    SACRED_SITES, REGION_MAP, DISCLAIMER = load_sacred_sites()
+    global _CACHES
     # also reload images in case new files were deployed
-    global IMAGE_MANIFEST
-    IMAGE_MANIFEST = load_image_manifest()
-    return jsonify({"reloaded": True, "sites": len(SACRED_SITES), "images": len(IMAGE_MANIFEST)}), 200
+    c = _build_caches(*load_sacred_sites(), load_image_manifest())
+    _CACHES = c
+    # under gunicorn each worker has its own caches; this only reloaded the
+    # one that took the request (see README: restart to reload all workers)
+    return _json_response({
+        "reloaded": True,
+        "scope": "worker",
+        "pid": os.getpid(),
+        "sites": len(c.sacred_sites),
+        "images": len(c.image_manifest)
+    }, 200)
 
 @app.route("/sites", methods=["GET"])
 def get_sites():
-    names = [info.get("site", k) for k, info in SACRED_SITES.items()]
-    return jsonify({"sites": sorted(names)})
+    return _precompressed_response(*_CACHES.sites_json)
 
 @app.route("/sites-by-country", methods=["GET"])
 def sites_by_country():
-    mapping = {region: sorted(names) for region, names in sorted(REGION_MAP.items())}
-    return jsonify(mapping)
+    return _precompressed_response(*_CACHES.sites_by_country_json)
 
 @app.route("/countries", methods=["GET"])
 def list_countries():
-    return jsonify({"countries": sorted(REGION_MAP.keys())})
+    return _precompressed_response(*_CACHES.countries_json)
 
 @app.route("/sites-for-country", methods=["GET"])
 def sites_for_country():
     country = request.args.get("country", type=str)
     if not country:
-        return jsonify({"error": "Missing 'country'"}), 400
-    lc_map = {norm_text(r): r for r in REGION_MAP.keys()}
-    key = lc_map.get(norm_text(country))
+        return _json_response({"error": "Missing 'country'"}, 400)
+    c = _CACHES
+    key = c.lc_country_map.get(norm_text(country))
     if not key:
-        return jsonify({"error": f"Unknown country '{country}'", "hint": "GET /countries"}), 404
-    return jsonify({"country": key, "sites": sorted(REGION_MAP[key])}), 200
+        return _json_response({"error": f"Unknown country '{country}'", "hint": "GET /countries"}, 404)
+    return _cached_json_response(*c.country_json[key])
 
 @app.route("/site-info", methods=["GET"])
 def site_info():
     site = request.args.get("site", type=str)
     if not site:
-        return jsonify({"error": "Missing 'site' query parameter", "hint": "Use /sites to list valid names"}), 400
-    site_k = norm_text(site)
-    if site_k not in SACRED_SITES:
-        return jsonify({"error": f"Site '{site}' not found", "hint": "Use /sites to list valid names"}), 404
+        return _json_response({"error": "Missing 'site' query parameter", "hint": "Use /sites to list valid names"}, 400)
+    parts = _CACHES.site_info_parts.get(norm_text(site))
+    if parts is None:
+        return _json_response({"error": f"Site '{site}' not found", "hint": "Use /sites to list valid names"}, 404)
 
-    info = SACRED_SITES[site_k]
-    # allow alternate keys if present
-    geometry_notes = info.get("geometry", info.get("sacred_geometry_notes", ""))
-    sim_method = info.get("sim_method", info.get("simulation_method", ""))
-
-    display_name = info.get("site", site)
-    img_file = image_filename_for_site(display_name)
-
-    info_out = {
-        "site": display_name,
-        "region": info.get("region", info.get("country", "")),
-        "status": info.get("status", ""),
-        "rt60": info.get("rt60"),
-        "dims": info.get("dims"),
-        "geometry": geometry_notes,
-        "description": info.get("description", ""),
-        "why_sacred": info.get("why_sacred", ""),
-        "who_for": info.get("who_for", ""),
-        "health_benefits": info.get("health_benefits", ""),
-        "sim_method": sim_method,
-        "sources": info.get("sources", ""),
-        "image_url": (url_for("static", filename=f"site-images/{img_file}", _external=True) if img_file else None),
-        "disclaimer": DISCLAIMER
-    }
-    return jsonify(np_to_native(info_out)), 200
+    head, img_file, tail = parts
+    image_url = url_for("static", filename=f"site-images/{img_file}", _external=True) if img_file else None
+    return _precompressed_response(*_site_info_variants(head, image_url, tail))
 
 @app.route("/site-image", methods=["GET"])
 def site_image():
     site = request.args.get("site", type=str)
     if not site:
-        return jsonify({"error": "Missing 'site' query parameter"}), 400
+        return _json_response({"error": "Missing 'site' query parameter"}, 400)
 
+    c = _CACHES
     # 1) Try to resolve directly from the manifest by title
-    filename = image_filename_for_site(site)
+    filename = image_filename_for_site(site, c.image_manifest, c.manifest_norm)
 
-    # 2) If not found, try via SACRED_SITES canonical display name
+    # 2) If not found, try via the catalog's canonical display name
     if not filename:
-        site_k = _norm_key(site)
-        if site_k in SACRED_SITES:
-            display_name = SACRED_SITES[site_k].get("site", site)
-            filename = image_filename_for_site(display_name)
+        info = c.sacred_sites.get(_norm_key(site))
+        if info is not None:
+            display_name = info.get("site", site)
+            filename = image_filename_for_site(display_name, c.image_manifest, c.manifest_norm)
             site = display_name  # for the response
 
     if filename:
-        return jsonify({
+        return _json_response({
             "site": site,
             "image_url": url_for("static", filename=f"site-images/{filename}", _external=True)
-        }), 200
+        }, 200)
 
-    return jsonify({
+    return _json_response({
         "error": f"No image found for '{site}'",
         "hint": "Check spelling or ensure it exists in static/site-images/manifest.json"
-    }), 404
+    }, 404)
+
+# octave/third-octave band sets fit comfortably; anything larger is rejected
+MAX_BANDS = 32
 
 @app.route("/generate-ir", methods=["POST"])
 def generate_ir():
@@ -380,61 +587,35 @@ def generate_ir():
         data = request.get_json(force=True, silent=True) or {}
         site = data.get("site")
         if not site:
-            return jsonify({"error": "Missing 'site'"}), 400
+            return _json_response({"error": "Missing 'site'"}, 400)
 
+        c = _CACHES
         site_k = norm_text(site)
-        if site_k not in SACRED_SITES:
-            return jsonify({"error": f"Site '{site}' not found"}), 404
-
-        bands = data.get("bands", STD_BANDS)
-        bands = [int(b) for b in bands]
-
-        fmax = float(data.get("fmax_hz", 2000.0))
-        top_n = int(data.get("modes_top_n", 24))
-        info = SACRED_SITES[site_k]
-
-        dims = [float(x) for x in info["dims"]]
-        base_rt = float(info["rt60"])
-
-        V = room_volume(dims)
-        S = room_surface(dims)
-        rt60_by_band = rt60_tilt_by_band(base_rt, bands)
-        alpha_avg = avg_absorption_from_rt60(base_rt, V, S)
-        fs = schroeder_frequency(base_rt, V)
-        tail_ref = float(min(3.0, max(1.0, base_rt)))
-
-        geometry_notes = info.get("geometry", info.get("sacred_geometry_notes", ""))
-        sim_method = info.get("sim_method", info.get("simulation_method", ""))
-
-        payload = {
-            "site": info.get("site", site),
-            "region": info.get("region", info.get("country", "")),
-            "status": info.get("status", ""),
-            "dims_m": dims,
-            "volume_m3": V,
-            "surface_area_m2": S,
-            "absorption_avg": alpha_avg,
-            "rt60_s_by_band": rt60_by_band,
-            "schroeder_freq_hz": fs,
-            "modal_summary": modal_list(dims, fmax=fmax, top_n=top_n, rt60_by_band=rt60_by_band),
-            "early_reflection_taps": early_reflections(dims, alpha_avg, n=6),
-            "ir_tail_sec_reference": tail_ref,
-            "method": "simulation_only_shoebox_analytics",
-            "notes": geometry_notes,
-            "description": info.get("description", ""),
-            "why_sacred": info.get("why_sacred", ""),
-            "who_for": info.get("who_for", ""),
-            "health_benefits": info.get("health_benefits", ""),
-            "sim_method": sim_method,
-            "sources": info.get("sources", ""),
-            "disclaimer": DISCLAIMER
-        }
-        return jsonify(np_to_native(payload)), 200
+        info = c.sacred_sites.get(site_k)
+        if info is None:
+            return _json_response({"error": f"Site '{site}' not found"}, 404)
+
+        bands, fmax, top_n = data.get("bands"), data.get("fmax_hz"), data.get("modes_top_n")
+        if bands is None and fmax is None and top_n is None:
+            cached = c.default_payloads.get(site_k)
+            if cached is not None:
+                return _precompressed_response(*cached)
+
+        if bands is not None and (not isinstance(bands, list) or len(bands) > MAX_BANDS):
+            # bands ends up in the acoustics LRU keys, so its size is bounded here
+            return _json_response({"error": f"bands must be a list of at most {MAX_BANDS} integers"}, 400)
+        bands = [int(b) for b in (STD_BANDS if bands is None else bands)]
+        fmax = 2000.0 if fmax is None else float(fmax)
+        top_n = 24 if top_n is None else int(top_n)
+        payload = build_ir_payload(c, site_k, info, bands, fmax, top_n)
+        return _compressed_json_response(_dumps(payload))
     except ValueError:
-        return jsonify({"error": "bands must be a list of integers"}), 400
+        return _json_response({"error": "bands must be a list of integers"}, 400)
     except Exception as e:
-        return jsonify({"error": "simulation failed", "detail": str(e)}), 500
+        return _json_response({"error": "simulation failed", "detail": str(e)}, 500)
 
 if __name__ == "__main__":
+    # local development only; production runs `gunicorn wsgi:app` (see Procfile)
+    print("Starting the Werkzeug dev server; use `gunicorn wsgi:app` in production.", file=sys.stderr)
     port = int(os.environ.get("PORT", 10000))
     app.run(host="0.0.0.0", port=port, debug=False)
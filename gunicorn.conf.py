@@ -0,0 +1,32 @@
+# Gunicorn settings, read automatically from the working directory:
+#   gunicorn wsgi:app
+import gc
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '10000')}"
+
+
+def _default_workers():
+    # cpu_count() reports host CPUs inside containers, not the instance's quota;
+    # the affinity mask is closer, and the cap keeps small instances in memory
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:  # not available on macOS
+        cpus = os.cpu_count() or 1
+    return min(cpus, 4)
+
+
+workers = int(os.environ.get("WEB_CONCURRENCY", _default_workers()))
+worker_class = "gthread"
+threads = int(os.environ.get("GUNICORN_THREADS", 2))
+
+# Import app.py once in the master (catalog, precomputed payloads, numba kernel)
+# and fork workers from it so those pages are shared copy-on-write.
+preload_app = True
+
+
+def pre_fork(server, worker):
+    # The preloaded catalog is never mutated. Freezing moves it out of the
+    # collector's generations so worker GC passes do not write to (and un-share)
+    # those pages.
+    gc.freeze()
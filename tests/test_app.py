@@ -0,0 +1,236 @@
+import gzip
+import json
+import math
+import random
+
+import pytest
+
+import acoustics
+import app
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+DECODE = {None: lambda b: b, "gzip": gzip.decompress}
+if brotli is not None:
+    DECODE["br"] = brotli.decompress
+
+
+@pytest.fixture
+def client():
+    return app.app.test_client()
+
+
+def _sites():
+    return [info["site"] for info in app._CACHES.sacred_sites.values()]
+
+
+# -----------------------------
+# Reference implementation (the original per-mode loop)
+# -----------------------------
+
+def _ref_rt60_tilt_by_band(base_rt, bands):
+    return {str(int(f)): float(max(0.2, base_rt - 0.18 * math.log10(max(f, 125) / 500.0))) for f in bands}
+
+
+def _ref_modal_list(dims, fmax, top_n, rt60_by_band):
+    Lx, Ly, Lz = dims
+    modes = []
+    for nx in range(12):
+        for ny in range(12):
+            for nz in range(12):
+                if nx == ny == nz == 0:
+                    continue
+                f = (acoustics.C_SOUND / 2.0) * math.sqrt(
+                    (nx / max(Lx, 1e-6)) ** 2 + (ny / max(Ly, 1e-6)) ** 2 + (nz / max(Lz, 1e-6)) ** 2
+                )
+                if f <= fmax:
+                    bands = [int(b) for b in rt60_by_band]
+                    T_here = rt60_by_band[str(min(bands, key=lambda x: abs(x - f)))]
+                    B = 13.815510558 / (math.pi * max(T_here, 1e-6))
+                    peak_e = (1.0 / max(B, 1e-6)) * (1.0 / max(f, 50.0))
+                    modes.append({
+                        "freq_hz": f, "nx": nx, "ny": ny, "nz": nz,
+                        "type": acoustics.modal_type(nx, ny, nz),
+                        "bandwidth_hz": B, "gauss_sigma_hz": B / 2.355, "rel_energy": peak_e,
+                    })
+    modes.sort(key=lambda m: (m["freq_hz"], -m["rel_energy"]))
+    sel = modes[:top_n]
+    esum = sum(m["rel_energy"] for m in sel) or 1.0
+    for m in sel:
+        m["rel_energy"] /= esum
+    return sel
+
+
+def _ref_early_reflections(dims, alpha_avg):
+    L, W, H = dims
+    paths = [0.0, 2 * L, 2 * W, 2 * H, 2 * math.sqrt(L * L + W * W), 2 * math.sqrt(L * L + H * H)]
+    taps = []
+    for d in paths:
+        if d == 0.0:
+            e = 1.0
+        else:
+            bounces = 1 if d in (2 * L, 2 * W, 2 * H) else 2
+            e = (1.0 - alpha_avg) ** bounces / max(d * d, 1e-6)
+        taps.append([d / acoustics.C_SOUND * 1000.0, e])
+    total = sum(e for _, e in taps) or 1.0
+    return [[t, e / total] for t, e in taps]
+
+
+def _assert_close(a, b, path=""):
+    if isinstance(a, dict):
+        assert set(a) == set(b), path
+        for k in a:
+            _assert_close(a[k], b[k], f"{path}.{k}")
+    elif isinstance(a, list):
+        assert len(a) == len(b), path
+        for i, (x, y) in enumerate(zip(a, b)):
+            _assert_close(x, y, f"{path}[{i}]")
+    elif isinstance(a, float):
+        assert math.isclose(a, b, rel_tol=1e-12, abs_tol=1e-15), (path, a, b)
+    else:
+        assert a == b, (path, a, b)
+
+
+# -----------------------------
+# Mode kernels
+# -----------------------------
+
+def test_numba_kernel_matches_numpy(monkeypatch):
+    pytest.importorskip("numba")
+    assert acoustics._mode_kernel is not acoustics._modes_numpy
+    modal = acoustics._modal_list_cached.__wrapped__  # bypass the LRU
+    rng = random.Random(7)
+    cases = []
+    for _ in range(300):
+        dims = tuple(rng.choice([rng.uniform(0.3, 80.0), 1.715, 3.43, 5.0]) for _ in range(3))
+        fmax = rng.choice([rng.uniform(10.0, 3000.0), 343.0, 2000.0])
+        top_n = rng.choice([0, 1, 5, 24, 200])
+        rt = tuple(sorted(acoustics.rt60_tilt_by_band(rng.uniform(0.3, 8.0), acoustics.STD_BANDS).items()))
+        cases.append((dims, fmax, top_n, rng.choice([rt, ()])))
+    compiled = [modal(*case) for case in cases]
+    monkeypatch.setattr(acoustics, "_mode_kernel", acoustics._modes_numpy)
+    for case, expected in zip(cases, compiled):
+        assert modal(*case) == expected, case  # bit-identical, including order
+
+
+@pytest.mark.parametrize("body", [{}, {"fmax_hz": 300}, {"modes_top_n": 5}, {"bands": [63, 8000, 250]}])
+def test_generate_ir_matches_reference(client, body):
+    for site in _sites()[:5]:
+        r = client.post("/generate-ir", json={"site": site, **body})
+        assert r.status_code == 200
+        out = r.get_json()
+        bands = body.get("bands", acoustics.STD_BANDS)
+        base_rt = app._CACHES.sacred_sites[app.norm_text(site)]["rt60"]
+        rt60 = _ref_rt60_tilt_by_band(float(base_rt), bands)
+        _assert_close(out["rt60_s_by_band"], rt60)
+        _assert_close(out["modal_summary"], _ref_modal_list(
+            out["dims_m"], float(body.get("fmax_hz", 2000.0)), body.get("modes_top_n", 24), rt60))
+        _assert_close(out["early_reflection_taps"], _ref_early_reflections(out["dims_m"], out["absorption_avg"]))
+
+
+def test_generate_ir_rejects_oversized_bands(client):
+    site = _sites()[0]
+    r = client.post("/generate-ir", json={"site": site, "bands": list(range(app.MAX_BANDS + 1))})
+    assert r.status_code == 400
+
+
+# -----------------------------
+# ETags, 304s and content negotiation
+# -----------------------------
+
+def _get_endpoints():
+    site, country = _sites()[0], next(iter(app._CACHES.region_map))
+    return [
+        ("/sites", {}),
+        ("/countries", {}),
+        ("/sites-by-country", {}),
+        ("/sites-for-country", {"country": country}),
+        ("/site-info", {"site": site}),
+    ]
+
+
+@pytest.mark.parametrize("path,query", _get_endpoints())
+def test_get_and_head_revalidate(client, path, query):
+    r = client.get(path, query_string=query)
+    assert r.status_code == 200
+    etag = r.headers["ETag"]
+    assert r.headers["Cache-Control"] == "no-cache"
+    for method in (client.get, client.head):
+        for inm in (etag, "W/" + etag, "*"):
+            r2 = method(path, query_string=query, headers={"If-None-Match": inm})
+            assert r2.status_code == 304, (method, inm)
+            assert r2.data == b""
+            assert r2.headers["ETag"] == etag
+    assert client.get(path, query_string=query, headers={"If-None-Match": '"nope"'}).status_code == 200
+
+
+@pytest.mark.parametrize("body", [{}, {"fmax_hz": 300}])
+def test_post_is_never_conditional(client, body):
+    payload = {"site": _sites()[0], **body}
+    r = client.post("/generate-ir", json=payload)
+    etag = r.headers["ETag"]
+    r2 = client.post("/generate-ir", json=payload, headers={"If-None-Match": etag})
+    assert r2.status_code == 200
+    assert r2.data == r.data
+    assert r2.headers["ETag"] == etag
+
+
+ACCEPT_ENCODINGS = [None, "identity", "gzip", "br", "gzip;q=0", "br;q=0, gzip;q=0", "br;q=0, gzip", "*"]
+
+
+def _refused(accept, coding):
+    if coding is None or not accept:
+        return False
+    for part in accept.split(","):
+        name, _, q = part.strip().partition(";q=")
+        if name == coding and q and float(q) == 0:
+            return True
+    return accept == "identity"
+
+
+@pytest.mark.parametrize("accept", ACCEPT_ENCODINGS)
+def test_accept_encoding_if_none_match_matrix(client, accept):
+    site = _sites()[0]
+    requests = [("get", path, {"query_string": query}) for path, query in _get_endpoints()] + [
+        ("post", "/generate-ir", {"json": {"site": site}}),
+        ("post", "/generate-ir", {"json": {"site": site, "fmax_hz": 300}}),
+    ]
+    headers = {"Accept-Encoding": accept} if accept is not None else {}
+    for method, path, kw in requests:
+        plain = getattr(client, method)(path, headers={"Accept-Encoding": "identity"}, **kw)
+        r = getattr(client, method)(path, headers=headers, **kw)
+        coding = r.headers.get("Content-Encoding")
+        assert not _refused(accept, coding), (path, accept, coding)
+        assert json.loads(DECODE[coding](r.data)) == json.loads(plain.data), (path, accept)
+        expected = plain.headers["ETag"] if coding is None else f'{plain.headers["ETag"][:-1]}:{coding}"'
+        assert r.headers["ETag"] == expected, (path, accept)
+        if path != "/sites-for-country":  # small bodies, never encoded
+            assert "Accept-Encoding" in r.headers.get("Vary", "")
+        if method == "get":
+            same = client.get(path, headers={**headers, "If-None-Match": r.headers["ETag"]}, **kw)
+            assert same.status_code == 304, (path, accept)
+            if coding is not None:
+                # the identity tag does not validate an encoded representation
+                other = client.get(path, headers={**headers, "If-None-Match": plain.headers["ETag"]}, **kw)
+                assert other.status_code == 200, (path, accept)
+
+
+# -----------------------------
+# Reload
+# -----------------------------
+
+def test_reload_replaces_caches_as_one_snapshot(client):
+    before = app._CACHES
+    r = client.post("/reload")
+    assert r.status_code == 200
+    out = r.get_json()
+    assert out["scope"] == "worker" and out["reloaded"] is True
+    after = app._CACHES
+    assert after is not before
+    assert set(after.lc_country_map.values()) == set(after.country_json)
+    assert set(after.site_info_parts) == set(after.sacred_sites)
+    assert set(after.default_payloads) <= set(after.site_index)
+    assert client.get("/sites").headers["ETag"] == f'"{after.sites_json[1]}"'
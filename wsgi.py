@@ -0,0 +1,4 @@
+# WSGI entrypoint: gunicorn wsgi:app (settings in gunicorn.conf.py)
+from app import app
+
+__all__ = ["app"]